@@ -6,6 +6,8 @@ This module handles all HTTP communication, encryption, and decryption
 for Mitsubishi MAC-577IF-2E devices.
 """
 
+from __future__ import annotations
+
 import base64
 import logging
 import re
@@ -50,7 +52,8 @@ class MitsubishiAPI:
 
         # Add retry logic with backoff for better reliability
         retries = Retry(total=4, backoff_factor=1)
-        self.session.mount("http://", HTTPAdapter(max_retries=retries))
+        # We only ever talk to a single device, so keep a small pool of kept-alive connections to it
+        self.session.mount("http://", HTTPAdapter(max_retries=retries, pool_connections=1, pool_maxsize=2))
 
     def get_crypto_key(self) -> bytes:
         """Get the crypto key - now just returns the properly sized key"""
@@ -73,7 +76,7 @@ class MitsubishiAPI:
         return base64.b64encode(iv + encrypted).decode("utf-8")
 
     def decrypt_payload(self, payload_b64: str) -> str:
-        logger.debug(f"Base64 payload length: {len(payload_b64)}")
+        logger.debug("Base64 payload length: %d", len(payload_b64))
 
         # Convert base64 directly to bytes
         encrypted = base64.b64decode(payload_b64)  # may raise
@@ -82,14 +85,15 @@ class MitsubishiAPI:
         iv = encrypted[:KEY_SIZE]
         encrypted_data = encrypted[KEY_SIZE:]
 
-        logger.debug(f"IV: {iv.hex()}")
-        logger.debug(f"Encrypted data length: {len(encrypted_data)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("IV: %s", iv.hex())
+        logger.debug("Encrypted data length: %d", len(encrypted_data))
 
         # Decrypt using AES CBC
         cipher = AES.new(self.encryption_key, AES.MODE_CBC, iv)
         decrypted = cipher.decrypt(encrypted_data)  # may raise, e.g. when invalid length
 
-        logger.debug(f"Decrypted raw length: {len(decrypted)}")
+        logger.debug("Decrypted raw length: %d", len(decrypted))
 
         # Try to remove ISO 7816-4 padding first
         try:
@@ -99,15 +103,15 @@ class MitsubishiAPI:
             logger.debug("ISO 7816-4 unpadding failed, using zero padding removal")
             decrypted_clean = decrypted.rstrip(b"\x00")
 
-        logger.debug(f"After padding removal length: {len(decrypted_clean)}")
+        logger.debug("After padding removal length: %d", len(decrypted_clean))
 
         # Try to decode as UTF-8
         try:
             result: str = decrypted_clean.decode("utf-8")
-            logger.debug(f"Decrypted XML response: {result}")
+            logger.debug("Decrypted XML response: %s", result)
             return result
         except UnicodeDecodeError as ude:
-            logger.debug(f"UTF-8 decode error at position {ude.start}: {ude.reason}")
+            logger.debug("UTF-8 decode error at position %d: %s", ude.start, ude.reason)
 
             # Try to find the actual end of the XML by looking for closing tags
             xml_end_patterns = [b"</LSV>", b"</CSV>", b"</ESV>"]
@@ -116,7 +120,7 @@ class MitsubishiAPI:
                 if pos != -1:
                     end_pos = pos + len(pattern)
                     truncated = decrypted_clean[:end_pos]
-                    logger.debug(f"Found XML end pattern {pattern.decode('utf-8')} at position {pos}")
+                    logger.debug("Found XML end pattern %s at position %d", pattern.decode("utf-8"), pos)
                     try:
                         truncated_result: str = truncated.decode("utf-8")
                         return truncated_result
@@ -125,7 +129,7 @@ class MitsubishiAPI:
 
             # If no valid XML end found, try errors='ignore'
             fallback_result: str = decrypted_clean.decode("utf-8", errors="ignore")
-            logger.debug(f"Using errors='ignore', result length: {len(fallback_result)}")
+            logger.debug("Using errors='ignore', result length: %d", len(fallback_result))
             return fallback_result
 
     def make_request(self, payload_xml: str) -> str:
@@ -154,9 +158,11 @@ class MitsubishiAPI:
         response = self.session.post(url, data=request_body, headers=headers, timeout=2)  # may raise
         response.raise_for_status()  # may raise
 
-        logger.debug("Response Text:")
-        logger.debug(response.text)
-        root = ET.fromstring(response.text)  # may raise
+        if logger.isEnabledFor(logging.DEBUG):  # avoid decoding the response text when it's not logged
+            logger.debug("Response Text:")
+            logger.debug(response.text)
+        # Parse the raw bytes: the XML declaration specifies the encoding, no need to decode it to text first
+        root = ET.fromstring(response.content)  # may raise
         encrypted_response = root.text
         if encrypted_response:
             decrypted = self.decrypt_payload(encrypted_response)
@@ -181,7 +187,7 @@ class MitsubishiAPI:
         return self.send_hex_command(command.hex())
 
     def send_hex_command(self, hex_command: str) -> str:
-        logger.debug(f"🔧 Sending command: {hex_command}")
+        logger.debug("🔧 Sending command: %s", hex_command)
         payload_xml = f"<CSV><CONNECT>ON</CONNECT><CODE><VALUE>{hex_command}</VALUE></CODE></CSV>"
         return self.make_request(payload_xml)
 
@@ -190,15 +196,16 @@ class MitsubishiAPI:
         url = f"http://{self.device_host_port}/unitinfo"
         auth = HTTPBasicAuth(self.admin_username, self.admin_password)
 
-        logger.debug(f"Fetching unit info from {url}")
+        logger.debug("Fetching unit info from %s", url)
 
         response = self.session.get(url, auth=auth, timeout=2)  # may raise
         response.raise_for_status()
 
-        logger.debug(f"Unit info HTML response received ({len(response.text)} chars)")
+        html = response.text
+        logger.debug("Unit info HTML response received (%d chars)", len(html))
 
         # Parse the HTML response to extract unit information
-        return self._parse_unit_info_html(response.text)
+        return self._parse_unit_info_html(html)
 
     @staticmethod
     def _parse_unit_info_html(html_content: str) -> dict[str, Any]:
@@ -234,3 +241,9 @@ class MitsubishiAPI:
         """Close the session"""
         if self.session:
             self.session.close()
+
+    def __enter__(self) -> MitsubishiAPI:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -6,8 +6,15 @@ This module is responsible for managing control operations and state
 for Mitsubishi MAC-577IF-2E devices.
 """
 
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable, Iterator
+import contextlib
+import dataclasses
 import logging
-from typing import Any
+import time
+from typing import Any, cast
 import xml.etree.ElementTree as ET
 
 from .mitsubishi_api import MitsubishiAPI
@@ -30,11 +37,13 @@ logger = logging.getLogger(__name__)
 
 class MitsubishiChangeSet:
     desired_state: GeneralStates
+    skip_unchanged: bool
     changes: Controls
     changes08: Controls08
 
-    def __init__(self, current_state: GeneralStates):
-        self.desired_state = current_state
+    def __init__(self, current_state: GeneralStates, skip_unchanged: bool = False):
+        self.desired_state = dataclasses.replace(current_state)  # copy, so the current state stays untouched
+        self.skip_unchanged = skip_unchanged
         self.changes = Controls.NoControl
         self.changes08 = Controls08.NoControl
 
@@ -42,38 +51,70 @@ class MitsubishiChangeSet:
     def empty(self) -> bool:
         return self.changes == Controls.NoControl and self.changes08 == Controls08.NoControl
 
+    # With `skip_unchanged`, the setters only flag a change when the value differs from the current state,
+    # so re-applying the current settings doesn't send a command. Only use it when the current state is known to
+    # reflect every command sent, a command response may not show the previous command yet.
     def set_power(self, power: PowerOnOff):
-        self.desired_state.power_on_off = power
-        self.changes |= Controls.PowerOnOff
+        if not self.skip_unchanged or self.desired_state.power_on_off != power:
+            self.desired_state.power_on_off = power
+            self.changes |= Controls.PowerOnOff
 
     def set_mode(self, drive_mode: DriveMode):
+        # Always sent: the reported mode is masked to its lower bits, so it can't be compared reliably
         mode_value = 8 if drive_mode == DriveMode.AUTO else drive_mode.value
         self.desired_state.drive_mode = mode_value
         self.changes |= Controls.DriveMode
 
     def set_temperature(self, temperature: float):
-        self.desired_state.temperature = temperature
-        self.changes |= Controls.Temperature
+        if not self.skip_unchanged or self.desired_state.temperature != temperature:
+            self.desired_state.temperature = temperature
+            self.changes |= Controls.Temperature
 
     def set_dehumidifier(self, humidity: int):
-        self.desired_state.dehum_setting = humidity
-        self.changes08 |= Controls08.Dehum
+        if not self.skip_unchanged or self.desired_state.dehum_setting != humidity:
+            self.desired_state.dehum_setting = humidity
+            self.changes08 |= Controls08.Dehum
 
     def set_fan_speed(self, fan_speed: WindSpeed):
-        self.desired_state.wind_speed = fan_speed
-        self.changes |= Controls.WindSpeed
+        if not self.skip_unchanged or self.desired_state.wind_speed != fan_speed:
+            self.desired_state.wind_speed = fan_speed
+            self.changes |= Controls.WindSpeed
 
     def set_vertical_vane(self, v_vane: VerticalWindDirection):
-        self.desired_state.vertical_wind_direction = v_vane
-        self.changes |= Controls.UpDownWindDirection
+        if not self.skip_unchanged or self.desired_state.vertical_wind_direction != v_vane:
+            self.desired_state.vertical_wind_direction = v_vane
+            self.changes |= Controls.UpDownWindDirection
 
     def set_horizontal_vane(self, h_vane: HorizontalWindDirection):
-        self.desired_state.horizontal_wind_direction = h_vane
-        self.changes |= Controls.LeftRightWindDirect
+        if not self.skip_unchanged or self.desired_state.horizontal_wind_direction != h_vane:
+            self.desired_state.horizontal_wind_direction = h_vane
+            self.changes |= Controls.LeftRightWindDirect
 
     def set_power_saving(self, power_saving: bool):
-        self.desired_state.is_power_saving = power_saving
-        self.changes08 |= Controls08.PowerSaving
+        if not self.skip_unchanged or self.desired_state.is_power_saving != power_saving:
+            self.desired_state.is_power_saving = power_saving
+            self.changes08 |= Controls08.PowerSaving
+
+    # GeneralStates field name -> setter method, used by update()
+    _FIELD_SETTERS = {
+        "power_on_off": "set_power",
+        "drive_mode": "set_mode",
+        "temperature": "set_temperature",
+        "dehum_setting": "set_dehumidifier",
+        "wind_speed": "set_fan_speed",
+        "vertical_wind_direction": "set_vertical_vane",
+        "horizontal_wind_direction": "set_horizontal_vane",
+        "is_power_saving": "set_power_saving",
+    }
+
+    def update(self, overrides: dict[str, Any]):
+        """Apply several changes at once, keyed by GeneralStates field name"""
+        for field, value in overrides.items():
+            try:
+                setter = self._FIELD_SETTERS[field]
+            except KeyError:
+                raise ValueError(f"Unsupported setting: {field}") from None
+            getattr(self, setter)(value)
 
 
 class MitsubishiController:
@@ -82,11 +123,23 @@ class MitsubishiController:
     wait_time_after_command = 5  # Number of seconds after a command that the result is visible in the returned status
     # Found experimentally by increasing until I reliably saw my updates
 
+    status_max_age = 5  # Number of seconds a status fetch is trusted to skip unchanged settings
+    # The unit can also be changed with its IR remote, which only shows up in the next status fetch
+
+    refresh_after_write = False  # Have async_apply_changeset() wait for the command to settle and re-fetch the status
+
+    unit_info_ttl = 300  # Number of seconds get_unit_info() reuses its previous result
+
     def __init__(self, api: MitsubishiAPI):
         self.api = api
         self.profile_code: list[bytes] = []
+        self._profile_code_hex: list[str] | None = None
         self.state: ParsedDeviceState | None = None
         self.unit_info: dict[str, dict[str, Any]] = {}
+        self._unit_info_time: float | None = None
+        self._last_response: str | bytes | None = None
+        self._last_command_time: float | None = None
+        self._status_fetch_time: float | None = None
 
     @classmethod
     def create(cls, device_host_port: str, encryption_key: str | bytes = "unregistered"):
@@ -94,53 +147,126 @@ class MitsubishiController:
         api = MitsubishiAPI(device_host_port=device_host_port, encryption_key=encryption_key)
         return cls(api)
 
+    def close(self) -> None:
+        """Close the connection(s) to the device"""
+        self.api.close()
+
+    def __enter__(self) -> MitsubishiController:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def fetch_status(self) -> ParsedDeviceState:
         """Fetch current device status and optionally detect capabilities"""
+        fetch_time = time.monotonic()
         response = self.api.send_status_request()  # may raise
-        return self._parse_status_response(response)
+        state = self._parse_status_response(response)
+        self._status_fetch_time = fetch_time
+        return state
 
-    def _parse_status_response(self, response: str) -> ParsedDeviceState:
-        """Parse the device status response and update state"""
-        # Parse the XML response
-        root = ET.fromstring(response)  # may raise
+    async def async_fetch_status(self) -> ParsedDeviceState:
+        """Async variant of fetch_status()
 
-        # Extract code values for parsing
-        code_values_elems = root.findall(".//CODE/VALUE")
-        code_values = [elem.text for elem in code_values_elems if elem.text]
+        The blocking HTTP round-trip runs in a worker thread, so the event loop stays free
+        (e.g. to poll other devices) while waiting for the device to answer.
+        """
+        return await asyncio.to_thread(self.fetch_status)
+
+    def _parse_status_response(self, response: str | bytes) -> ParsedDeviceState:
+        """Parse the device status response and update state"""
+        if response == self._last_response and self.state is not None:
+            # Commands often get answered with exactly the previous status, which would parse to the same state
+            return self.state
+
+        code_values: list[str] = []
+        profile_data_values: list[str] = []  # PROFILECODE/DATA/VALUE
+        profile_values: list[str] = []  # PROFILECODE/VALUE
+        mac = serial = None
+
+        # Collect all fields in a single streaming pass, instead of building a tree and searching it repeatedly
+        parser: ET.XMLPullParser[ET.Element] = ET.XMLPullParser(events=("start", "end"))
+        parser.feed(response)  # may raise
+        parser.close()  # may raise
+        path: list[str] = []
+        # Only start/end events were requested, so every event carries an element
+        events = cast("Iterator[tuple[str, ET.Element]]", parser.read_events())
+        for event, elem in events:
+            if event == "start":
+                path.append(elem.tag)
+                continue
+
+            path.pop()
+            tag = elem.tag
+            if tag == "VALUE":
+                if elem.text and path:
+                    parent = path[-1]
+                    if parent == "CODE":
+                        code_values.append(elem.text)
+                    elif parent == "PROFILECODE":
+                        profile_values.append(elem.text)
+                    elif parent == "DATA" and len(path) >= 2 and path[-2] == "PROFILECODE":
+                        profile_data_values.append(elem.text)
+            elif tag == "MAC" and mac is None:
+                mac = elem.text or ""
+            elif tag == "SERIAL" and serial is None:
+                serial = elem.text or ""
+            elem.clear()
 
         # Use the parser module to get structured state
         self.state = ParsedDeviceState.parse_code_values(code_values)
 
-        # Extract and set device identity
-        mac_elem = root.find(".//MAC")
-        if mac_elem is not None and mac_elem.text is not None:
-            self.state.mac = mac_elem.text
+        # Set device identity
+        if mac:
+            self.state.mac = mac
+        if serial:
+            self.state.serial = serial
 
-        serial_elem = root.find(".//SERIAL")
-        if serial_elem is not None and serial_elem.text is not None:
-            self.state.serial = serial_elem.text
-
-        profile_elems = root.findall(".//PROFILECODE/DATA/VALUE") or root.findall(".//PROFILECODE/VALUE")
-        self.profile_code = []
-        for elem in profile_elems:
-            if elem.text:
-                self.profile_code.append(bytes.fromhex(elem.text))
+        profile_code_hex = profile_data_values or profile_values
+        if profile_code_hex != self._profile_code_hex:  # profile codes hardly ever change, don't decode them again
+            self.profile_code = [bytes.fromhex(value) for value in profile_code_hex]
+            self._profile_code_hex = profile_code_hex
 
+        self._last_response = response
         return self.state
 
-    def _ensure_state_available(self):
-        if self.state is None or self.state.general is None:
+    def _ensure_state_available(self, force_refresh: bool = False) -> GeneralStates | None:
+        """Fetch the status, unless a previous status or command response already provided it
+
+        Returns the general state, or None if the device didn't report one.
+        """
+        if force_refresh or self.state is None or self.state.general is None:
             self.fetch_status()
+        return self.state.general if self.state is not None else None
+
+    def changeset(self, force_refresh: bool = False) -> MitsubishiChangeSet:
+        """Start a set of changes relative to the last known state
 
-    def changeset(self) -> MitsubishiChangeSet:
-        self._ensure_state_available()
-        if self.state is None or self.state.general is None:
+        Every command response carries the full status, so the device is only queried when no state is known yet,
+        or when `force_refresh` is set.
+        """
+        general = self._ensure_state_available(force_refresh)
+        if general is None:
             raise RuntimeError("Failed to fetch device state")
-        return MitsubishiChangeSet(self.state.general)
+        return MitsubishiChangeSet(general, skip_unchanged=self._state_is_settled())
+
+    def _state_is_settled(self) -> bool:
+        """Whether the known state comes from a recent status fetch that already shows every command sent
+
+        Command responses (and status fetches right after a command) may not reflect the last command yet,
+        and older fetches may miss changes made with the IR remote, so comparing against them could drop a command
+        that is still needed.
+        """
+        if self._status_fetch_time is None or time.monotonic() - self._status_fetch_time >= self.status_max_age:
+            return False
+        if self._last_command_time is None:
+            return True
+        return self._status_fetch_time - self._last_command_time >= self.wait_time_after_command
 
     def apply_changeset(self, cs: MitsubishiChangeSet) -> ParsedDeviceState | None:
         new_state = None
 
+        # Command responses lag behind, so the returned state may not reflect either change yet
         if cs.changes != Controls.NoControl:
             new_state = self._send_general_control_command(cs.desired_state, cs.changes)
 
@@ -149,31 +275,98 @@ class MitsubishiController:
 
         return new_state
 
-    def _create_updated_state(self, **overrides) -> GeneralStates:
+    async def async_changeset(self, force_refresh: bool = False) -> MitsubishiChangeSet:
+        """Async variant of changeset()"""
+        return await asyncio.to_thread(self.changeset, force_refresh)
+
+    async def async_apply_changeset(self, cs: MitsubishiChangeSet) -> ParsedDeviceState | None:
+        """Async variant of apply_changeset()
+
+        The response to the command is returned as-is, unless `refresh_after_write` is set.
+        """
+        new_state = await asyncio.to_thread(self.apply_changeset, cs)
+        if new_state is not None and self.refresh_after_write:
+            new_state = await self.async_refresh()
+        return new_state
+
+    async def async_refresh(self) -> ParsedDeviceState:
+        """Wait until the last command is visible in the status, then fetch it"""
+        # The status can only be fetched after the wait: fetching it concurrently would return the old state
+        await asyncio.sleep(self.wait_time_after_command)
+        return await self.async_fetch_status()
+
+    def apply_changes(self, overrides: dict[str, Any]) -> ParsedDeviceState | None:
+        """Change several settings with as few commands as possible
+
+        `overrides` is keyed by GeneralStates field name, e.g.
+        `{"power_on_off": PowerOnOff.ON, "drive_mode": DriveMode.COOLER, "temperature": 22.5}`.
+        All general settings are combined into a single control command.
+        """
+        cs = self.changeset()
+        cs.update(overrides)
+        return self.apply_changeset(cs)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[MitsubishiChangeSet]:
+        """Collect changes in a changeset, and send them when the block ends
+
+        with controller.batch() as cs:
+            cs.set_mode(DriveMode.COOLER)
+            cs.set_temperature(22.5)
+
+        Nothing is sent if the block raises.
+        """
+        cs = self.changeset()
+        yield cs
+        self.apply_changeset(cs)
+
+    @contextlib.asynccontextmanager
+    async def async_batch(self) -> AsyncIterator[MitsubishiChangeSet]:
+        """Async variant of batch()"""
+        cs = await self.async_changeset()
+        yield cs
+        await self.async_apply_changeset(cs)
+
+    async def async_apply_changes(self, overrides: dict[str, Any]) -> ParsedDeviceState | None:
+        """Async variant of apply_changes()"""
+        cs = await self.async_changeset()
+        cs.update(overrides)
+        return await self.async_apply_changeset(cs)
+
+    @classmethod
+    async def gather_status(cls, ctrls: Iterable[MitsubishiController]) -> list[ParsedDeviceState]:
+        """Fetch the status of several devices concurrently
+
+        The requests overlap, so polling N devices takes about as long as the slowest one
+        instead of the sum of all round-trips. Results are in the same order as `ctrls`.
+        """
+        return await asyncio.gather(*(ctrl.async_fetch_status() for ctrl in ctrls))
+
+    @classmethod
+    async def gather_apply(
+        cls, jobs: Iterable[tuple[MitsubishiController, dict[str, Any]]]
+    ) -> list[ParsedDeviceState | None]:
+        """Apply changes to several devices concurrently, see apply_changes()
+
+        `jobs` holds (controller, overrides) pairs. Results are in the same order as `jobs`.
+        """
+        return await asyncio.gather(*(ctrl.async_apply_changes(overrides) for ctrl, overrides in jobs))
+
+    @staticmethod
+    def _create_updated_state(general: GeneralStates | None, **overrides) -> GeneralStates:
         """Create updated state with specified field overrides"""
-        if not self.state or not self.state.general:
+        # Not a field, but a property setting both coarse & fine temperature. Like the device, fill in the fine
+        # temperature from the current temperature too, so it is also sent when only the coarse one was reported
+        temperature = overrides.pop("temperature", general.temperature if general is not None else None)
+        if temperature is not None:
+            overrides["coarse_temperature"] = int(temperature)
+            overrides["fine_temperature"] = temperature
+
+        if general is None:
             # Create default state if none exists
             return GeneralStates(**overrides)
 
-        return GeneralStates(
-            power_on_off=overrides.get("power_on_off", self.state.general.power_on_off),
-            coarse_temperature=int(overrides.get("temperature", self.state.general.temperature)),
-            fine_temperature=overrides.get("temperature", self.state.general.temperature),
-            drive_mode=overrides.get("drive_mode", self.state.general.drive_mode),
-            wind_speed=overrides.get("wind_speed", self.state.general.wind_speed),
-            vertical_wind_direction=overrides.get(
-                "vertical_wind_direction", self.state.general.vertical_wind_direction
-            ),
-            horizontal_wind_direction=overrides.get(
-                "horizontal_wind_direction", self.state.general.horizontal_wind_direction
-            ),
-            dehum_setting=overrides.get("dehum_setting", self.state.general.dehum_setting),
-            is_power_saving=overrides.get("is_power_saving", self.state.general.is_power_saving),
-            wind_and_wind_break_direct=overrides.get(
-                "wind_and_wind_break_direct", self.state.general.wind_and_wind_break_direct
-            ),
-            remote_lock=overrides.get("remote_lock", self.state.general.remote_lock),
-        )
+        return dataclasses.replace(general, **overrides)
 
     def set_power(self, power_on: bool) -> ParsedDeviceState | None:
         cs = self.changeset()
@@ -192,10 +385,13 @@ class MitsubishiController:
         else:
             cmd.mode = SetRemoteTemperature.Mode.RemoteTemp
             cmd.remote_temperature = temperature_celsius
-        command = cmd.generate_command()
-        response = self.api.send_command(command)
+        response = self._send_hex_command(cmd.generate_command().hex())
         self.state = self._parse_status_response(response)
 
+    async def async_set_current_temperature(self, temperature_celsius: float | None) -> None:
+        """Async variant of set_current_temperature()"""
+        await asyncio.to_thread(self.set_current_temperature, temperature_celsius)
+
     def set_mode(self, mode: DriveMode) -> ParsedDeviceState | None:
         cs = self.changeset()
         cs.set_mode(mode)
@@ -228,19 +424,13 @@ class MitsubishiController:
 
     def send_buzzer_command(self, enabled: bool = True) -> ParsedDeviceState:
         """Send buzzer control command"""
-        self._ensure_state_available()
-        if self.state is not None and self.state.general is not None:
-            general_state = self.state.general
-        else:
-            general_state = GeneralStates()
+        general_state = self._ensure_state_available() or GeneralStates()
         new_state = self._send_extend08_command(general_state, Controls08.Buzzer)
         self.state = new_state
         return new_state
 
     def set_remote_lock(self, lock: RemoteLock) -> ParsedDeviceState:
-        self._ensure_state_available()
-
-        updated_state = self._create_updated_state(remote_lock=lock)
+        updated_state = self._create_updated_state(self._ensure_state_available(), remote_lock=lock)
         new_state = self._send_general_control_command(updated_state, Controls.RemoteLock)
         self.state = new_state
         return new_state
@@ -249,26 +439,55 @@ class MitsubishiController:
         """Send a general control command to the device"""
         # Generate the hex command
         hex_command = state.generate_general_command(controls).hex()
-        response = self.api.send_hex_command(hex_command)
+        response = self._send_hex_command(hex_command)
         return self._parse_status_response(response)
 
     def _send_extend08_command(self, state: GeneralStates, controls: Controls08) -> ParsedDeviceState:
         """Send an extend08 command for advanced features"""
         # Generate the hex command
         hex_command = state.generate_extend08_command(controls).hex()
-        response = self.api.send_hex_command(hex_command)
+        response = self._send_hex_command(hex_command)
         return self._parse_status_response(response)
 
+    def _send_hex_command(self, hex_command: str) -> str:
+        self._last_command_time = time.monotonic()
+        return self.api.send_hex_command(hex_command)
+
+    def reboot(self) -> None:
+        """Reboot the device"""
+        self._last_command_time = time.monotonic()
+        self.api.send_reboot_request()
+
     def enable_echonet(self) -> None:
         """Send ECHONET enable command"""
         self.api.send_echonet_enable()
 
-    def get_unit_info(self) -> dict[str, Any]:
-        """Get detailed unit information from the admin interface"""
+    def get_unit_info(self, force_refresh: bool = False) -> dict[str, Any]:
+        """Get detailed unit information from the admin interface
+
+        The information hardly ever changes, so it is cached for `unit_info_ttl` seconds.
+        """
+        now = time.monotonic()
+        if not force_refresh and self._unit_info_time is not None and now - self._unit_info_time < self.unit_info_ttl:
+            return self.unit_info
+
         self.unit_info = self.api.get_unit_info()
-        logger.debug(
-            f"✅ Unit info retrieved: "
-            f"{len(self.unit_info.get('Adaptor Information', {}))} adaptor fields, "
-            f"{len(self.unit_info.get('Unit Info', {}))} unit fields"
-        )
+        self._unit_info_time = now
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "✅ Unit info retrieved: %d adaptor fields, %d unit fields",
+                len(self.unit_info.get("Adaptor Information", {})),
+                len(self.unit_info.get("Unit Info", {})),
+            )
         return self.unit_info
+
+    async def async_get_unit_info(self, force_refresh: bool = False) -> dict[str, Any]:
+        """Async variant of get_unit_info()"""
+        return await asyncio.to_thread(self.get_unit_info, force_refresh)
+
+    def invalidate_cache(self) -> None:
+        """Forget cached unit info, profile codes and status, so they are fetched/decoded again"""
+        self._unit_info_time = None
+        self._profile_code_hex = None
+        self._last_response = None
+        self._status_fetch_time = None
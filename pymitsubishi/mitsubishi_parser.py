@@ -8,12 +8,35 @@ including enums, state classes, and functions for decoding hex values.
 
 from __future__ import annotations
 
+from collections.abc import Callable
 import dataclasses
 import enum
 import logging
+import math
+import struct
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Static parts of the general control command, the variable fields are filled in by generate_general_command()
+_GENERAL_COMMAND_TEMPLATE = b"\x41\x01\x30\x10\x01" + b"\0" * 14 + b"\x41"
+# Same for the extend08 command and generate_extend08_command()
+_EXTEND08_COMMAND_TEMPLATE = b"\x41\x01\x30\x10\x08" + b"\0" * 15
+# And for the remote temperature command and SetRemoteTemperature.generate_command()
+_REMOTE_TEMPERATURE_COMMAND_TEMPLATE = b"\x41\x01\x30\x10\x07" + b"\0" * 3
+
+# Unsigned big-endian integer fields
+_U16BE = struct.Struct(">H")
+_U32BE = struct.Struct(">I")
+# EnergyStates power_watt and energy_hecto_watt_hour, read together from data[10:14]
+_ENERGY_COUNTERS = struct.Struct(">HH")
+
+# Expected bytes 1-4 of a state payload, for the "62" and "7b" response variants
+_HEADER_62 = b"\x62\x01\x30\x10"
+_HEADER_7B = b"\x7b\x01\x30\x10"
+
+_HEX_DIGITS = "0123456789abcdef"
+
 
 class PowerOnOff(enum.Enum):
     OFF = 0
@@ -117,7 +140,31 @@ def log_unexpected_value(code_value: str, position: int, value: int | bytes):
     )
 
 
-def try_enum_or_log(code_value: str, position: int, value: int, enum_class: type):
+def _validate_header(code_value: str, data: bytes, group: int) -> None:
+    """Check the start byte, checksum, static header bytes and group code of a state payload"""
+    if data[0] != 0xFC:
+        raise ValueError(f"{code_value}[0] == 0x{data[0]:02x} != 0xfc")
+
+    calculated_fcc = calc_fcc(data[1:-1])
+    if calculated_fcc != data[-1]:
+        raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
+
+    # Verify for parts that we think are static; only look at the individual bytes on a mismatch
+    header = data[1:5]
+    if header != _HEADER_62 and header != _HEADER_7B:
+        if data[1] != 0x62 and data[1] != 0x7B:
+            log_unexpected_value(code_value, 1, data[1:2])
+        if data[2:5] != b"\x01\x30\x10":
+            log_unexpected_value(code_value, 2, data[2:5])
+    if data[5] != group:
+        raise ValueError(f"Not {code_value} message: data[5] == 0x{data[5]:02x} != 0x{group:02x}")
+
+
+def try_enum_or_log(code_value: str, position: int, value: int, enum_class: type[enum.Enum]):
+    # Fast path: look up known values directly, without going through EnumMeta.__call__ and its exception handling
+    member = enum_class._value2member_map_.get(value)
+    if member is not None:
+        return member
     try:
         return enum_class(value)
     except ValueError:
@@ -125,7 +172,7 @@ def try_enum_or_log(code_value: str, position: int, value: int, enum_class: type
         return value
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class GeneralStates:
     """Parsed general AC states from device response"""
 
@@ -163,7 +210,7 @@ class GeneralStates:
         """Check if payload contains general states data"""
         if len(data) < 6:
             return False
-        return data[1] in [0x62, 0x7B] and data[5] == 0x02
+        return (data[1] == 0x62 or data[1] == 0x7B) and data[5] == 0x02
 
     @classmethod
     def parse_general_states(cls, data: bytes) -> GeneralStates:
@@ -174,25 +221,13 @@ class GeneralStates:
         - Wide vane adjustment flag detection
         - i-See sensor detection from mode byte
         """
-        logger.debug(f"Parsing general states payload: {data.hex()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing general states payload: %s", data.hex())
 
         if len(data) < 21:
             raise ValueError("GeneralStates payload too short")
 
-        if data[0] != 0xFC:
-            raise ValueError(f"GeneralStates[0] == 0x{data[0]:02x} != 0xfc")
-
-        calculated_fcc = calc_fcc(data[1:-1])
-        if calculated_fcc != data[-1]:
-            raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
-
-        # Verify for parts that we think are static:
-        if data[1] != 0x62 and data[1] != 0x7B:
-            log_unexpected_value(cls.__name__, 1, data[1:2])
-        if data[2:5] != b"\x01\x30\x10":
-            log_unexpected_value(cls.__name__, 2, data[2:5])
-        if data[5] != 0x02:
-            raise ValueError(f"Not GeneralStates message: data[5] == 0x{data[5]:02x} != 0x02")
+        _validate_header(cls.__name__, data, 0x02)
 
         obj = cls.__new__(cls)
 
@@ -222,7 +257,7 @@ class GeneralStates:
         obj.wide_vane_adjustment = (wide_vane_data & 0xF0) == 0x80  # Upper 4 bits = 0x80
 
         if data[16] != 0x00:
-            obj.fine_temperature = (data[16] - 0x80) / 2
+            obj.fine_temperature = (data[16] - 0x80) * 0.5
         else:
             obj.fine_temperature = None
 
@@ -237,37 +272,33 @@ class GeneralStates:
         return obj
 
     def generate_general_command(self, controls: Controls) -> bytes:
-        cmd = bytearray(b"\x41\x01\x30\x10\x01")
-        cmd += b"\0" * 15
+        cmd = bytearray(_GENERAL_COMMAND_TEMPLATE)
 
-        controls |= Controls.OutsideControl
-        cmd[5:7] = controls.to_bytes(2, byteorder="big", signed=False)
+        _U16BE.pack_into(cmd, 5, controls | Controls.OutsideControl)
         cmd[7] = self.power_on_off.value
         cmd[8] = self.drive_mode.value if isinstance(self.drive_mode, DriveMode) else self.drive_mode
         # TODO: figure out how to combine mode with iSee; Mode changes don't seem to work when >0x08
         cmd[9] = 31 - int(self.temperature)
         cmd[10] = self.wind_speed.value
         cmd[11] = self.vertical_wind_direction.value
-        cmd[12] = 0
-        cmd[13] = 0
-        cmd[14] = 0
+        # cmd[12:15] = 0
 
         cmd[15] = self.remote_lock.value  # Changes written in different location vs current status
         # https://github.com/pymitsubishi/pymitsubishi/issues/13#issuecomment-3346213470
 
-        cmd[16] = 0
+        # cmd[16] = 0
         cmd[17] = self.horizontal_wind_direction.value
         cmd[18] = 0x80 + int(self.fine_temperature * 2) if self.fine_temperature is not None else 0x00
-        cmd[19] = 0x41
+        # cmd[19] = 0x41
 
         # Calculate and append FCC
-        fcc = calc_fcc(cmd)
-        return b"\xfc" + cmd + bytes([fcc])
+        cmd.append(calc_fcc(cmd))
+        return b"\xfc" + cmd
 
     def generate_extend08_command(self, controls: Controls08) -> bytes:
-        cmd = bytearray(b"\x41\x01\x30\x10\x08")
-        cmd += b"\0" * 15
-        cmd[5:6] = controls.to_bytes(1, byteorder="big", signed=False)
+        cmd = bytearray(_EXTEND08_COMMAND_TEMPLATE)
+
+        cmd[5] = controls
         # cmd[6:8] = 0
         cmd[8] = self.dehum_setting if (controls & Controls08.Dehum) else 0
         cmd[9] = 0x0A if self.is_power_saving else 0x00
@@ -275,11 +306,11 @@ class GeneralStates:
         cmd[11] = 0x01 if (controls & Controls08.Buzzer) else 0x00
         # cmd[12:20] = 0
 
-        fcc = calc_fcc(cmd)
-        return b"\xfc" + cmd + bytes([fcc])
+        cmd.append(calc_fcc(cmd))
+        return b"\xfc" + cmd
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class SensorStates:
     """Parsed sensor states from device response"""
 
@@ -298,29 +329,17 @@ class SensorStates:
         """Check if payload contains sensor states data"""
         if len(data) < 6:
             return False
-        return data[1] in [0x62, 0x7B] and data[5] == 0x03
+        return (data[1] == 0x62 or data[1] == 0x7B) and data[5] == 0x03
 
     @classmethod
     def parse_sensor_states(cls, data: bytes) -> SensorStates:
         """Parse sensor states from hex payload"""
-        logger.debug(f"Parsing sensor states payload: {data.hex()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing sensor states payload: %s", data.hex())
         if len(data) < 21:
             raise ValueError("SensorStates payload too short")
 
-        if data[0] != 0xFC:
-            raise ValueError(f"SensorStates[0] == 0x{data[0]:02x} != 0xfc")
-
-        calculated_fcc = calc_fcc(data[1:-1])
-        if calculated_fcc != data[-1]:
-            raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
-
-        # Verify for parts that we think are static:
-        if data[1] != 0x62 and data[1] != 0x7B:
-            log_unexpected_value(cls.__name__, 1, data[1:2])
-        if data[2:5] != b"\x01\x30\x10":
-            log_unexpected_value(cls.__name__, 2, data[2:5])
-        if data[5] != 0x03:
-            raise ValueError(f"Not SensorStates message: data[5] == 0x{data[5]:02x} != 0x03")
+        _validate_header(cls.__name__, data, 0x03)
 
         obj = cls.__new__(cls)
 
@@ -347,7 +366,7 @@ class SensorStates:
         if data[14] != 0x42:
             log_unexpected_value(cls.__name__, 14, data[14])
 
-        obj.runtime_minutes = int.from_bytes(data[15:19], "big", signed=False)
+        obj.runtime_minutes = _U32BE.unpack_from(data, 15)[0]
         # runtime is at least 24 bit long data[16:19]
         # Since 24 bits is a bit odd, I'm assuming it's 32bit and join in an additional leading 0x00 at data[15]
 
@@ -357,7 +376,7 @@ class SensorStates:
         return obj
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class EnergyStates:
     """Parsed energy and operational states from device response"""
 
@@ -370,7 +389,7 @@ class EnergyStates:
         """Check if payload contains energy/status data (SwiCago group 06)"""
         if len(data) < 6:
             return False
-        return data[1] in [0x62, 0x7B] and data[5] == 0x06
+        return (data[1] == 0x62 or data[1] == 0x7B) and data[5] == 0x06
 
     @classmethod
     def parse_energy_states(cls, data: bytes, general_states: GeneralStates | None = None) -> EnergyStates:
@@ -384,24 +403,12 @@ class EnergyStates:
             data: payload as bytes
             general_states: Optional general states for power estimation context
         """
-        logger.debug(f"Parsing energy states payload: {data.hex()}")
-        if len(data) < 12:  # Need at least enough bytes for data[4]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing energy states payload: %s", data.hex())
+        if len(data) < 15:  # Need at least data[10:14] and the FCC
             raise ValueError("EnergyStates payload too short")
 
-        if data[0] != 0xFC:
-            raise ValueError(f"EnergyStates[0] == 0x{data[0]:02x} != 0xfc")
-
-        calculated_fcc = calc_fcc(data[1:-1])
-        if calculated_fcc != data[-1]:
-            raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
-
-        # Verify for parts that we think are static:
-        if data[1] != 0x62 and data[1] != 0x7B:
-            log_unexpected_value(cls.__name__, 1, data[1:2])
-        if data[2:5] != b"\x01\x30\x10":
-            log_unexpected_value(cls.__name__, 2, data[2:5])
-        if data[5] != 0x06:
-            raise ValueError(f"Not EnergyStates message: data[5] == 0x{data[5]:02x} != 0x06")
+        _validate_header(cls.__name__, data, 0x06)
 
         obj = cls.__new__(cls)
 
@@ -414,8 +421,8 @@ class EnergyStates:
 
         # The outdoor unit is reported as part of the first indoor unit (port A)
         # Doesn't match exactly with my power meter, but it's close.
-        obj.power_watt = int.from_bytes(data[10:12], "big", signed=False)
-        obj.energy_hecto_watt_hour = int.from_bytes(data[12:14], "big", signed=False)  # in 100Wh units
+        # energy_hecto_watt_hour is in 100Wh units
+        obj.power_watt, obj.energy_hecto_watt_hour = _ENERGY_COUNTERS.unpack_from(data, 10)
 
         if data[14:-1] != b"\0\0\x42\0\0\0\0":
             log_unexpected_value(cls.__name__, 12, data[12:-1])
@@ -423,7 +430,7 @@ class EnergyStates:
         return obj
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ErrorStates:
     """Parsed error states from device response"""
 
@@ -438,36 +445,24 @@ class ErrorStates:
         """Check if payload contains error states data"""
         if len(data) < 6:
             return False
-        return data[1] in [0x62, 0x7B] and data[5] == 0x04
+        return (data[1] == 0x62 or data[1] == 0x7B) and data[5] == 0x04
 
     @classmethod
     def parse_error_states(cls, data: bytes) -> ErrorStates:
         """Parse error states from hex payload"""
-        logger.debug(f"Parsing error states payload: {data.hex()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing error states payload: %s", data.hex())
         if len(data) < 11:
             raise ValueError("ErrorStates payload too short")
 
-        if data[0] != 0xFC:
-            raise ValueError(f"ErrorStates[0] == 0x{data[0]:02x} != 0xfc")
-
-        calculated_fcc = calc_fcc(data[1:-1])
-        if calculated_fcc != data[-1]:
-            raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
-
-        # Verify for parts that we think are static:
-        if data[1] != 0x62 and data[1] != 0x7B:
-            log_unexpected_value(cls.__name__, 1, data[1:2])
-        if data[2:5] != b"\x01\x30\x10":
-            log_unexpected_value(cls.__name__, 2, data[2:5])
-        if data[5] != 0x04:
-            raise ValueError(f"Not ErrorStates message: data[5] == 0x{data[5]:02x} != 0x04")
+        _validate_header(cls.__name__, data, 0x04)
 
         obj = cls.__new__(cls)
 
         if data[6:9] != b"\0\0\0":
             log_unexpected_value(cls.__name__, 6, data[6:9])
 
-        obj.error_code = int.from_bytes(data[9:11], "big")
+        obj.error_code = _U16BE.unpack_from(data, 9)[0]
 
         if data[11:-1] != b"\0\0\0\0\0\0\0\0\0\0":
             log_unexpected_value(cls.__name__, 11, data[11:-1])
@@ -475,36 +470,24 @@ class ErrorStates:
         return obj
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Unknown5States:
     @staticmethod
     def is_unknown5_states_payload(data: bytes) -> bool:
         """Check if payload contains error states data"""
         if len(data) < 6:
             return False
-        return data[1] in [0x62, 0x7B] and data[5] == 0x05
+        return (data[1] == 0x62 or data[1] == 0x7B) and data[5] == 0x05
 
     @classmethod
     def parse_unknown5_states(cls, data: bytes) -> Unknown5States:
         """Parse error states from hex payload"""
-        logger.debug(f"Parsing {cls.__name__} payload: {data.hex()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing %s payload: %s", cls.__name__, data.hex())
         if len(data) < 6:
             raise ValueError(f"{cls.__name__} payload too short")
 
-        if data[0] != 0xFC:
-            raise ValueError(f"{cls.__name__}[0] == 0x{data[0]:02x} != 0xfc")
-
-        calculated_fcc = calc_fcc(data[1:-1])
-        if calculated_fcc != data[-1]:
-            raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
-
-        # Verify for parts that we think are static:
-        if data[1] != 0x62 and data[1] != 0x7B:
-            log_unexpected_value(cls.__name__, 1, data[1:2])
-        if data[2:5] != b"\x01\x30\x10":
-            log_unexpected_value(cls.__name__, 2, data[2:5])
-        if data[5] != 0x05:
-            raise ValueError(f"Not {cls.__name__} message: data[5] == 0x{data[5]:02x} != 0x05")
+        _validate_header(cls.__name__, data, 0x05)
 
         obj = cls.__new__(cls)
 
@@ -514,7 +497,7 @@ class Unknown5States:
         return obj
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class AutoStates:
     power_mode: int = 0
     auto_mode: AutoMode = AutoMode.OFF
@@ -524,29 +507,17 @@ class AutoStates:
         """Check if payload contains error states data"""
         if len(data) < 6:
             return False
-        return data[1] in [0x62, 0x7B] and data[5] == 0x09
+        return (data[1] == 0x62 or data[1] == 0x7B) and data[5] == 0x09
 
     @classmethod
     def parse_unknown9_states(cls, data: bytes) -> AutoStates:
         """Parse error states from hex payload"""
-        logger.debug(f"Parsing {cls.__name__} payload: {data.hex()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing %s payload: %s", cls.__name__, data.hex())
         if len(data) < 6:
             raise ValueError(f"{cls.__name__} payload too short")
 
-        if data[0] != 0xFC:
-            raise ValueError(f"{cls.__name__}[0] == 0x{data[0]:02x} != 0xfc")
-
-        calculated_fcc = calc_fcc(data[1:-1])
-        if calculated_fcc != data[-1]:
-            raise ValueError(f"Invalid checksum, expected 0x{calculated_fcc:02x}, received 0x{data[-1]:02x}")
-
-        # Verify for parts that we think are static:
-        if data[1] != 0x62 and data[1] != 0x7B:
-            log_unexpected_value(cls.__name__, 1, data[1:2])
-        if data[2:5] != b"\x01\x30\x10":
-            log_unexpected_value(cls.__name__, 2, data[2:5])
-        if data[5] != 0x09:
-            raise ValueError(f"Not {cls.__name__} message: data[5] == 0x{data[5]:02x} != 0x09")
+        _validate_header(cls.__name__, data, 0x09)
 
         obj = cls.__new__(cls)
 
@@ -573,7 +544,7 @@ class AutoStates:
         return obj
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ParsedDeviceState:
     """Complete parsed device state combining all state types"""
 
@@ -593,35 +564,39 @@ class ParsedDeviceState:
     def parse_code_values(cls, code_values: list[str]) -> ParsedDeviceState:
         """Parse a list of code values and return combined device state with energy information"""
         parsed_state = ParsedDeviceState()
-        logger.debug(f"Parsing {len(code_values)} code values")
+        logger.debug("Parsing %d code values", len(code_values))
 
         for hex_value in code_values:
             value = bytes.fromhex(hex_value)
 
+            # Dispatch on the group code, instead of asking every state class in turn
+            if len(value) < 6 or (value[1] != 0x62 and value[1] != 0x7B) or value[5] not in _CODE_VALUE_PARSERS:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Ignoring unknown code value: %s", value.hex())
+                continue
+            field, parse = _CODE_VALUE_PARSERS[value[5]]
+
             try:
-                # Parse different payload types
-                if GeneralStates.is_general_states_payload(value):
-                    parsed_state.general = GeneralStates.parse_general_states(value)
-                elif SensorStates.is_sensor_states_payload(value):
-                    parsed_state.sensors = SensorStates.parse_sensor_states(value)
-                elif ErrorStates.is_error_states_payload(value):
-                    parsed_state.errors = ErrorStates.parse_error_states(value)
-                elif EnergyStates.is_energy_states_payload(value):
-                    # Parse energy states with context from general states if available
-                    parsed_state.energy = EnergyStates.parse_energy_states(value, parsed_state.general)
-                elif Unknown5States.is_unknown5_states_payload(value):
-                    parsed_state._unknown5 = Unknown5States.parse_unknown5_states(value)
-                elif AutoStates.is_auto_states_payload(value):
-                    parsed_state.auto_state = AutoStates.parse_unknown9_states(value)
-                else:
-                    logger.debug(f"Ignoring unknown code value: {value.hex()}")
+                setattr(parsed_state, field, parse(value, parsed_state))
             except ValueError as e:
-                logger.warning(f"Failed to parse code value: {e}\n{value.hex()}")
+                logger.warning("Failed to parse code value: %s\n%s", e, value.hex())
 
         return parsed_state
 
 
-@dataclasses.dataclass
+# Group code (data[5]) -> (ParsedDeviceState attribute, parser)
+_CODE_VALUE_PARSERS: dict[int, tuple[str, Callable[[bytes, ParsedDeviceState], Any]]] = {
+    0x02: ("general", lambda data, _: GeneralStates.parse_general_states(data)),
+    0x03: ("sensors", lambda data, _: SensorStates.parse_sensor_states(data)),
+    0x04: ("errors", lambda data, _: ErrorStates.parse_error_states(data)),
+    0x05: ("_unknown5", lambda data, _: Unknown5States.parse_unknown5_states(data)),
+    # Parse energy states with context from general states if available
+    0x06: ("energy", lambda data, state: EnergyStates.parse_energy_states(data, state.general)),
+    0x09: ("auto_state", lambda data, _: AutoStates.parse_unknown9_states(data)),
+}
+
+
+@dataclasses.dataclass(slots=True)
 class SetRemoteTemperature:
     class Mode(enum.IntFlag):
         UseInternal = 0x00
@@ -649,43 +624,34 @@ class SetRemoteTemperature:
         return int((temp * 2) + 0x80).to_bytes(1, "little")
 
     def generate_command(self) -> bytes:
-        cmd = bytearray(b"\x41\x01\x30\x10\x07")
-        cmd += b"\0" * 3
+        cmd = bytearray(_REMOTE_TEMPERATURE_COMMAND_TEMPLATE)
 
         cmd[5] = self.mode.value
-        cmd[6:7] = (
-            SetRemoteTemperature.temperature_to_legacy(self.remote_temperature)
-            if self.remote_temperature is not None
-            else b"\x00"
-        )
-        cmd[7:8] = (
-            SetRemoteTemperature.temperature_to_enhanced(self.remote_temperature)
-            if self.remote_temperature is not None
-            else b"\x00"
-        )
+        if self.remote_temperature is not None:
+            cmd[6:7] = SetRemoteTemperature.temperature_to_legacy(self.remote_temperature)
+            cmd[7:8] = SetRemoteTemperature.temperature_to_enhanced(self.remote_temperature)
+        # else: cmd[6:8] = 0
 
         # Calculate and append FCC
-        fcc = calc_fcc(cmd)
-        return b"\xfc" + cmd + bytes([fcc])
+        cmd.append(calc_fcc(cmd))
+        return b"\xfc" + cmd
 
 
 def calc_fcc(payload: bytes) -> int:
     """Calculate FCC checksum for Mitsubishi protocol payload"""
-    return (0x100 - (sum(payload[0:20]) % 0x100)) % 0x100  # TODO: do we actually need to limit this to 20 bytes?
+    return -sum(payload[0:20]) & 0xFF  # TODO: do we actually need to limit this to 20 bytes?
 
 
 def convert_temperature(temperature: int) -> str:
     """Convert temperature in 0.1°C units to segment format"""
     t = max(16, min(31, temperature))
-    e = 31 - int(t)
-    last_digit = "0" if str(t)[-1] == "0" else "1"
-    return last_digit + format(e, "x")
+    last_digit = "0" if str(t)[-1] == "0" else "1"  # also accepts floats, e.g. "24.0"
+    return last_digit + _HEX_DIGITS[31 - int(t)]
 
 
 def convert_temperature_to_segment(temperature: int) -> str:
     """Convert temperature to segment 14 format"""
-    value = 0x80 + (temperature // 0.5)
-    return format(int(value), "02x")
+    return format(0x80 + math.floor(temperature * 2), "02x")
 
 
 def get_normalized_temperature(hex_value: int) -> int:
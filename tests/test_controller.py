@@ -1,23 +1,192 @@
-from unittest.mock import Mock
+import asyncio
+from unittest.mock import Mock, patch
 
 import pytest
 
-from pymitsubishi import DriveMode, MitsubishiController, RemoteLock, SetRemoteTemperature
+from pymitsubishi import (
+    DriveMode,
+    GeneralStates,
+    MitsubishiAPI,
+    MitsubishiController,
+    PowerOnOff,
+    RemoteLock,
+    SetRemoteTemperature,
+)
+from pymitsubishi.mitsubishi_parser import Controls
 from tests.test_fixtures import REAL_DEVICE_XML_RESPONSE
 
 
-def test_set_power_on():
+@pytest.fixture
+def mock_api():
+    """API mock answering status requests and commands with the real device response"""
+    api = Mock(spec=MitsubishiAPI)
+    api.send_status_request.return_value = REAL_DEVICE_XML_RESPONSE
+    api.send_hex_command.return_value = REAL_DEVICE_XML_RESPONSE
+    return api
+
+
+def test_set_power_on(mock_api):
     """Test a complete cycle of status fetch and device control."""
-    mock_api = Mock()
     controller = MitsubishiController(mock_api)
-    mock_api.send_status_request.return_value = REAL_DEVICE_XML_RESPONSE
-    mock_api.send_hex_command = Mock(return_value=REAL_DEVICE_XML_RESPONSE)
 
     controller.set_power(True)
 
     mock_api.send_hex_command.assert_called_once_with("fc410130100101020100090000000000000000ac4183")
 
 
+def test_context_manager_closes_api(mock_api):
+    with MitsubishiController(mock_api) as controller:
+        assert controller.api is mock_api
+    mock_api.close.assert_called_once_with()
+
+
+def test_async_fetch_status(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    state = asyncio.run(controller.async_fetch_status())
+
+    assert state is controller.state
+    assert state.mac == "AA:BB:CC:DD:EE:FF"
+    mock_api.send_status_request.assert_called_once_with()
+
+
+def test_async_apply_changeset_refresh_after_write(mock_api):
+    controller = MitsubishiController(mock_api)
+    controller.wait_time_after_command = 0
+    controller.refresh_after_write = True
+
+    cs = controller.changeset()
+    cs.set_power(PowerOnOff.ON)
+    asyncio.run(controller.async_apply_changeset(cs))
+
+    mock_api.send_hex_command.assert_called_once()
+    assert mock_api.send_status_request.call_count == 2  # initial fetch + refresh
+
+
+@pytest.mark.parametrize(
+    "profile_xml",
+    [
+        "<PROFILECODE><VALUE>0a0b</VALUE><VALUE>0c</VALUE></PROFILECODE>",
+        "<PROFILECODE><DATA><VALUE>0a0b</VALUE><VALUE>0c</VALUE></DATA></PROFILECODE>",
+    ],
+)
+def test_parse_profile_codes(profile_xml):
+    controller = MitsubishiController(Mock(spec=MitsubishiAPI))
+
+    controller._parse_status_response(f"<LSV><MAC>AA:BB</MAC>{profile_xml}<CODE></CODE></LSV>")
+
+    assert controller.profile_code == [b"\x0a\x0b", b"\x0c"]
+    assert controller.state.mac == "AA:BB"
+
+
+def test_create_updated_state(mock_api):
+    controller = MitsubishiController(mock_api)
+    controller.fetch_status()
+
+    updated = controller._create_updated_state(
+        controller.state.general, remote_lock=RemoteLock.ModeLocked, temperature=24.5
+    )
+
+    assert updated is not controller.state.general
+    assert updated.remote_lock == RemoteLock.ModeLocked
+    assert updated.coarse_temperature == 24
+    assert updated.fine_temperature == 24.5
+    assert updated.drive_mode == controller.state.general.drive_mode
+    assert controller.state.general.remote_lock == RemoteLock.Unlocked
+
+
+def test_create_updated_state_coarse_temperature_only():
+    general = GeneralStates(coarse_temperature=23, fine_temperature=None)
+
+    updated = MitsubishiController._create_updated_state(general, remote_lock=RemoteLock.PowerLocked)
+
+    assert updated.fine_temperature == 23
+    assert updated.generate_general_command(Controls.RemoteLock)[19] == 0xAE  # segment 14 is still sent
+
+
+def test_gather_status():
+    controllers = []
+    for _ in range(3):
+        mock_api = Mock(spec=MitsubishiAPI)
+        mock_api.send_status_request.return_value = REAL_DEVICE_XML_RESPONSE
+        controllers.append(MitsubishiController(mock_api))
+
+    states = asyncio.run(MitsubishiController.gather_status(controllers))
+
+    assert states == [controller.state for controller in controllers]
+    for controller in controllers:
+        controller.api.send_status_request.assert_called_once()
+
+
+def test_gather_apply(mock_api):
+    controller = MitsubishiController(mock_api)
+    idle_api = Mock(spec=MitsubishiAPI)
+    idle_api.send_status_request.return_value = REAL_DEVICE_XML_RESPONSE
+    idle_controller = MitsubishiController(idle_api)
+
+    states = asyncio.run(
+        MitsubishiController.gather_apply([(controller, {"power_on_off": PowerOnOff.ON}), (idle_controller, {})])
+    )
+
+    assert states[0] is controller.state
+    assert states[1] is None
+    mock_api.send_hex_command.assert_called_once()
+    idle_api.send_hex_command.assert_not_called()
+
+
+def test_changeset_reuses_command_response(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    controller.set_power(True)
+    controller.set_mode(DriveMode.COOLER)
+    assert mock_api.send_status_request.call_count == 1  # state from the first command response is reused
+
+    controller.changeset(force_refresh=True)
+    assert mock_api.send_status_request.call_count == 2
+
+
+def test_parse_status_response_bytes():
+    controller = MitsubishiController(Mock(spec=MitsubishiAPI))
+    state = controller._parse_status_response(REAL_DEVICE_XML_RESPONSE.encode())
+    assert state == MitsubishiController(Mock(spec=MitsubishiAPI))._parse_status_response(REAL_DEVICE_XML_RESPONSE)
+    assert state.mac == "AA:BB:CC:DD:EE:FF"
+
+
+def test_parse_unchanged_response_reuses_state():
+    controller = MitsubishiController(Mock(spec=MitsubishiAPI))
+    state = controller._parse_status_response(REAL_DEVICE_XML_RESPONSE)
+    assert controller._parse_status_response(REAL_DEVICE_XML_RESPONSE) is state
+
+    controller.invalidate_cache()
+    new_state = controller._parse_status_response(REAL_DEVICE_XML_RESPONSE)
+    assert new_state is not state
+    assert new_state == state
+
+
+def test_changeset_does_not_modify_state(mock_api):
+    controller = MitsubishiController(mock_api)
+    controller.fetch_status()
+
+    cs = controller.changeset()
+    cs.set_power(PowerOnOff.ON)
+
+    assert cs.desired_state.power_on_off == PowerOnOff.ON
+    assert controller.state.general.power_on_off == PowerOnOff.OFF
+
+
+def test_get_unit_info_cached(mock_api):
+    controller = MitsubishiController(mock_api)
+    mock_api.get_unit_info.return_value = {"Adaptor Information": {"Channel": 6}}
+
+    assert controller.get_unit_info() == {"Adaptor Information": {"Channel": 6}}
+    controller.get_unit_info()
+    mock_api.get_unit_info.assert_called_once_with()
+
+    controller.invalidate_cache()
+    controller.get_unit_info()
+    assert mock_api.get_unit_info.call_count == 2
+
+
 @pytest.mark.parametrize(
     "mode, hex_cmd",
     [
@@ -27,30 +196,147 @@ def test_set_power_on():
         (DriveMode.HEATER, "fc410130100102020001090000000000000000ac4182"),
     ],
 )
-def test_set_auto(mode, hex_cmd):
+def test_set_auto(mode, hex_cmd, mock_api):
     """Test a complete cycle of status fetch and device control."""
-    mock_api = Mock()
     controller = MitsubishiController(mock_api)
-    mock_api.send_status_request.return_value = REAL_DEVICE_XML_RESPONSE
-    mock_api.send_hex_command = Mock(return_value=REAL_DEVICE_XML_RESPONSE)
 
     controller.set_mode(mode)
 
     mock_api.send_hex_command.assert_called_once_with(hex_cmd)
 
 
+def test_unchanged_settings_not_sent(mock_api):
+    controller = MitsubishiController(mock_api)
+    controller.fetch_status()
+    general = controller.state.general
+
+    cs = controller.changeset()
+    cs.set_power(general.power_on_off)
+    cs.set_temperature(general.temperature)
+    cs.set_fan_speed(general.wind_speed)
+    cs.set_vertical_vane(general.vertical_wind_direction)
+    cs.set_horizontal_vane(general.horizontal_wind_direction)
+    cs.set_dehumidifier(general.dehum_setting)
+    cs.set_power_saving(general.is_power_saving)
+    assert cs.empty
+
+    assert controller.apply_changeset(cs) is None
+    mock_api.send_hex_command.assert_not_called()
+
+
+def test_set_power_on_then_off(mock_api):
+    """The command response still reports the unit as off, the second command must be sent anyway."""
+    controller = MitsubishiController(mock_api)
+
+    assert controller.set_power(True) is not None
+    assert controller.set_power(False) is not None
+
+    assert [call.args[0] for call in mock_api.send_hex_command.call_args_list] == [
+        "fc410130100101020100090000000000000000ac4183",
+        "fc410130100101020000090000000000000000ac4184",
+    ]
+
+
+def test_unchanged_settings_skipped_after_settled_fetch(mock_api):
+    controller = MitsubishiController(mock_api)
+    controller.wait_time_after_command = 0
+    controller.set_power(True)
+    assert not controller.changeset().skip_unchanged  # state from the command response
+
+    controller.fetch_status()  # reports the unit as off
+    assert controller.set_power(False) is None
+    mock_api.send_hex_command.assert_called_once()
+
+
+def test_unchanged_settings_sent_after_old_fetch(mock_api):
+    """The unit may have been turned on with the IR remote since the last fetch."""
+    controller = MitsubishiController(mock_api)
+    controller.fetch_status()  # reports the unit as off
+    controller._status_fetch_time -= controller.status_max_age
+
+    assert controller.set_power(False) is not None
+    mock_api.send_hex_command.assert_called_once_with("fc410130100101020000090000000000000000ac4184")
+
+
+def test_remote_temperature_counts_as_command(mock_api):
+    controller = MitsubishiController(mock_api)
+    controller.wait_time_after_command = 1
+    controller.fetch_status()
+    controller.set_current_temperature(21.5)
+
+    assert not controller.changeset().skip_unchanged
+
+
+def test_apply_changes_single_command(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    controller.apply_changes({"power_on_off": PowerOnOff.ON, "drive_mode": DriveMode.COOLER})
+
+    mock_api.send_hex_command.assert_called_once_with("fc410130100103020103090000000000000000ac417e")
+
+
+def test_apply_changeset_general_and_extend08(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    cs = controller.changeset()
+    cs.set_power(PowerOnOff.ON)
+    cs.set_power_saving(True)
+    with patch.object(controller, "_parse_status_response", wraps=controller._parse_status_response) as parse:
+        new_state = controller.apply_changeset(cs)
+
+    assert mock_api.send_hex_command.call_count == 2
+    assert parse.call_count == 2  # both responses are checked
+    assert new_state is controller.state
+
+
+def test_batch(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    with controller.batch() as cs:
+        cs.set_power(PowerOnOff.ON)
+        cs.set_mode(DriveMode.COOLER)
+        mock_api.send_hex_command.assert_not_called()
+
+    mock_api.send_hex_command.assert_called_once()
+
+
+def test_batch_not_sent_on_error(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    with pytest.raises(KeyError), controller.batch() as cs:
+        cs.set_power(PowerOnOff.ON)
+        raise KeyError("oops")
+
+    mock_api.send_hex_command.assert_not_called()
+
+
+def test_async_batch(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    async def run():
+        async with controller.async_batch() as cs:
+            cs.set_power(PowerOnOff.ON)
+
+    asyncio.run(run())
+    mock_api.send_hex_command.assert_called_once()
+
+
+def test_apply_changes_unknown_field(mock_api):
+    controller = MitsubishiController(mock_api)
+
+    with pytest.raises(ValueError):
+        controller.apply_changes({"no_such_field": 1})
+
+
 @pytest.mark.parametrize(
     "lock, hex_cmd",
     [
         (RemoteLock.PowerLocked, "fc410130100140020000090000000000010000ac4144"),
     ],
 )
-def test_set_remote_lock(lock, hex_cmd):
+def test_set_remote_lock(lock, hex_cmd, mock_api):
     """Test a complete cycle of status fetch and device control."""
-    mock_api = Mock()
     controller = MitsubishiController(mock_api)
-    mock_api.send_status_request.return_value = REAL_DEVICE_XML_RESPONSE
-    mock_api.send_hex_command = Mock(return_value=REAL_DEVICE_XML_RESPONSE)
 
     controller.set_remote_lock(lock)
 
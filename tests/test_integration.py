@@ -212,6 +212,7 @@ class TestMitsubishiAPIIntegration:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = '<?xml version="1.0" encoding="UTF-8"?><ESV>mocked_encrypted_data</ESV>'
+        mock_response.content = mock_response.text.encode()
         mock_post.return_value = mock_response
 
         # Mock the decryption to return our real XML
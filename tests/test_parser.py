@@ -8,14 +8,22 @@ collected from real Mitsubishi MAC-577IF-2E devices.
 import pytest
 
 from pymitsubishi.mitsubishi_parser import (
+    AutoStates,
     Controls,
     Controls08,
+    EnergyStates,
+    ErrorStates,
     GeneralStates,
     ParsedDeviceState,
+    RemoteLock,
+    SensorStates,
+    Unknown5States,
+    WindSpeed,
     calc_fcc,
     convert_temperature,
     convert_temperature_to_segment,
     get_normalized_temperature,
+    try_enum_or_log,
 )
 
 from .test_fixtures import SAMPLE_CODE_VALUES, SAMPLE_PROFILE_CODES
@@ -35,6 +43,21 @@ def test_fcc(payload, expected):
     assert checksum == expected
 
 
+@pytest.mark.parametrize(
+    "enum_class,value,expected",
+    [
+        (WindSpeed, 3, WindSpeed.S3),
+        (RemoteLock, 0, RemoteLock.Unlocked),
+        (RemoteLock, 3, RemoteLock.PowerLocked | RemoteLock.ModeLocked),  # flag combination
+        (WindSpeed, 0x42, 0x42),  # unknown value is returned as-is
+    ],
+)
+def test_try_enum_or_log(enum_class, value, expected):
+    result = try_enum_or_log("Test", 0, value, enum_class)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
 def test_generate_general_command():
     cmd = GeneralStates().generate_general_command(Controls.NoControl)
     assert cmd == bytes.fromhex("fc410130100100020000090000000000000000ac4185")
@@ -80,6 +103,23 @@ class TestTemperatureConversion:
         assert get_normalized_temperature(0x7F) == 0  # Below minimum
         assert get_normalized_temperature(0xFF) == 400  # Above maximum
 
+    def test_temperature_conversion_float(self):
+        """Test float temperatures convert like their int counterparts."""
+        assert convert_temperature(24) == "17"
+        assert convert_temperature(24.0) == "07"
+        assert convert_temperature(22.5) == "19"
+
+    def test_temperature_to_segment(self):
+        """Test segment 14 values are 0x80 plus half-degree steps."""
+        assert convert_temperature_to_segment(0) == "80"
+        assert convert_temperature_to_segment(22) == "ac"
+        assert convert_temperature_to_segment(25) == "b2"
+
+    def test_temperature_to_segment_negative(self):
+        """Test negative temperatures round down to the half-degree step below."""
+        assert convert_temperature_to_segment(-0.3) == "7f"
+        assert convert_temperature_to_segment(-1.2) == "7d"
+
 
 class TestCodeValueParsing:
     """Test parsing of real CODE values from device responses."""
@@ -113,6 +153,26 @@ class TestCodeValueParsing:
             assert hasattr(parsed_state.general, "drive_mode")
             assert hasattr(parsed_state.general, "temperature")
 
+    def test_code_values_dispatch_on_group(self):
+        parsed_state = ParsedDeviceState.parse_code_values(
+            [
+                "fc7b013010c9030020001407f58c25a0be94bea0be89",  # group 0xc9: ignored
+                "fc620130100200000008090000000080ac46000000d8",
+                "fc620130100300000c009eacacfe4200011dfa000000",
+                "fc6201301004000000800000000000000000000000d9",
+                "fc620130100500000000000000000000000000000058",
+                "fc6201301006000000000010568a0000420000000025",
+                "fc620130100900000000000000000000000000000054",
+            ]
+        )
+
+        assert isinstance(parsed_state.general, GeneralStates)
+        assert isinstance(parsed_state.sensors, SensorStates)
+        assert isinstance(parsed_state.errors, ErrorStates)
+        assert isinstance(parsed_state._unknown5, Unknown5States)
+        assert isinstance(parsed_state.energy, EnergyStates)
+        assert isinstance(parsed_state.auto_state, AutoStates)
+
     def test_code_value_parsing_bad_checksum(self):
         bad_code_values = ["fc62013010020000000b070000000083b046000000d1"]
         ParsedDeviceState.parse_code_values(bad_code_values)
@@ -237,6 +297,18 @@ class TestErrorConditions:
         except ValueError:
             pass  # Expected
 
+    @pytest.mark.parametrize(
+        "code,message",
+        [
+            ("fd620130100200000008090000000080ac46000000d8", r"GeneralStates\[0\] == 0xfd != 0xfc"),
+            ("fc620130100200000008090000000080ac46000000d9", "Invalid checksum"),
+            ("fc62013010030000000809000000008000000000c9", "Not GeneralStates message"),
+        ],
+    )
+    def test_invalid_header(self, code, message):
+        with pytest.raises(ValueError, match=message):
+            GeneralStates.parse_general_states(bytes.fromhex(code))
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])